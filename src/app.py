@@ -5,7 +5,7 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 import os
@@ -78,18 +78,24 @@ activities = {
 }
 
 
+def get_activities_db():
+    """Dependency providing the activity database"""
+    return activities
+
+
 @app.get("/")
 def root():
     return RedirectResponse(url="/static/index.html")
 
 
 @app.get("/activities")
-def get_activities():
+def get_activities(activities: dict = Depends(get_activities_db)):
     return activities
 
 
 @app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
+def signup_for_activity(activity_name: str, email: str,
+                        activities: dict = Depends(get_activities_db)):
     """Sign up a student for an activity"""
     # Validate activity exists
     if activity_name not in activities:
@@ -106,7 +112,8 @@ def signup_for_activity(activity_name: str, email: str):
 
 
 @app.post("/activities/{activity_name}/unregister")
-def unregister_from_activity(activity_name: str, email: str):
+def unregister_from_activity(activity_name: str, email: str,
+                             activities: dict = Depends(get_activities_db)):
     """Unregister a student from an activity"""
     # Validate activity exists
     if activity_name not in activities: